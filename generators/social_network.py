@@ -16,17 +16,82 @@ Usage:
 
 import os
 import sys
+from datetime import date
 from pathlib import Path
 
 # Add python directory to path for utils
 sys.path.insert(0, str(Path(__file__).parent.parent / "python"))
 
-from rich.console import Console
-from rich.table import Table
+from utils.console import make_console, print_table
 from utils.neo4j_client import Neo4jClient
 
 
-console = Console()
+console = make_console()
+
+COMPANY_COUNT = 10
+PERSON_COUNT = 100
+
+
+def build_companies() -> list[dict]:
+    """Property maps for the Company nodes."""
+    industries = ["Technology", "Finance", "Healthcare"]
+    return [
+        {
+            "id": i,
+            "name": f"Company {i}",
+            "industry": industries[i % 3],
+            "founded": 2000 + i,
+            "employees": (i * 100) + 50,
+        }
+        for i in range(1, COMPANY_COUNT + 1)
+    ]
+
+
+def build_people() -> list[dict]:
+    """Property maps for the Person nodes."""
+    departments = ["Engineering", "Sales", "Marketing", "Operations"]
+    return [
+        {
+            "id": i,
+            "name": f"Person {i}",
+            "email": f"person{i}@example.com",
+            "age": 25 + (i % 40),
+            "department": departments[i % 4],
+        }
+        for i in range(1, PERSON_COUNT + 1)
+    ]
+
+
+def build_works_at() -> list[dict]:
+    """One WORKS_AT relationship per person, spread evenly across the companies."""
+    roles = ["Senior", "Junior", "Manager"]
+    return [
+        {
+            "person": i,
+            "company": (i % COMPANY_COUNT) + 1,
+            "properties": {
+                "since": date(2015 + (i % 8), (i % 12) + 1, 1),
+                "role": roles[i % 3],
+            },
+        }
+        for i in range(1, PERSON_COUNT + 1)
+    ]
+
+
+def build_knows() -> list[dict]:
+    """KNOWS relationships between people under id 50 who share the same id mod 10."""
+    return [
+        {
+            "from": i,
+            "to": j,
+            "properties": {
+                "since": date(2018 + (i % 5), 1, 1),
+                "relationship": "Colleague",
+            },
+        }
+        for i in range(1, 50)
+        for j in range(i + 10, PERSON_COUNT + 1, 10)
+    ]
 
 
 def main():
@@ -69,69 +134,51 @@ def main():
         console.print("[green]Constraints created successfully[/green]\n")
 
         # Create companies
-        console.print("[bold blue]Creating 10 companies...[/bold blue]")
+        console.print(f"[bold blue]Creating {COMPANY_COUNT} companies...[/bold blue]")
         client.execute_write("""
-            UNWIND range(1, 10) AS id
-            CREATE (c:Company {
-                id: id,
-                name: 'Company ' + toString(id),
-                industry: CASE id % 3
-                    WHEN 0 THEN 'Technology'
-                    WHEN 1 THEN 'Finance'
-                    ELSE 'Healthcare'
-                END,
-                founded: 2000 + id,
-                employees: (id * 100) + 50
-            })
-        """)
+            UNWIND $companies AS company
+            CREATE (c:Company)
+            SET c = company
+        """, {"companies": build_companies()})
         console.print("[green]Companies created successfully[/green]\n")
 
         # Create people (nodes only) so CDC has all nodes before relationship events
-        console.print("[bold blue]Creating 100 people...[/bold blue]")
-        client.execute_write("""
-            UNWIND range(1, 100) AS id
-            CREATE (p:Person {
-                id: id,
-                name: 'Person ' + toString(id),
-                email: 'person' + toString(id) + '@example.com',
-                age: 25 + (id % 40),
-                department: CASE id % 4
-                    WHEN 0 THEN 'Engineering'
-                    WHEN 1 THEN 'Sales'
-                    WHEN 2 THEN 'Marketing'
-                    ELSE 'Operations'
-                END
-            })
-        """)
+        console.print(f"[bold blue]Creating {PERSON_COUNT} people...[/bold blue]")
+        # CALL { ... } IN CONCURRENT TRANSACTIONS spreads the batches across server
+        # cores; it needs an auto-commit transaction (Neo4j 5.21+)
+        client.execute_auto_commit("""
+            UNWIND $people AS person
+            CALL (person) {
+                CREATE (p:Person)
+                SET p = person
+            } IN CONCURRENT TRANSACTIONS OF 25 ROWS
+        """, {"people": build_people()})
         console.print("[green]People created successfully[/green]\n")
 
-        # Create WORKS_AT relationships (after all nodes exist — helps CDC ordering)
-        console.print("[bold blue]Creating WORKS_AT relationships...[/bold blue]")
-        client.execute_write("""
-            UNWIND range(1, 100) AS id
-            MATCH (p:Person {id: id}), (c:Company {id: (id % 10) + 1})
-            CREATE (p)-[:WORKS_AT {
-                since: date({year: 2015 + (id % 8), month: (id % 12) + 1, day: 1}),
-                role: CASE id % 3
-                    WHEN 0 THEN 'Senior'
-                    WHEN 1 THEN 'Junior'
-                    ELSE 'Manager'
-                END
-            }]->(c)
-        """)
-        console.print("[green]WORKS_AT relationships created successfully[/green]\n")
-
-        # Create some KNOWS relationships between people
-        console.print("[bold blue]Creating social connections between people...[/bold blue]")
-        client.execute_write("""
-            MATCH (p1:Person), (p2:Person)
-            WHERE p1.id < p2.id AND p1.id % 10 = p2.id % 10 AND p1.id < 50
-            CREATE (p1)-[:KNOWS {
-                since: date({year: 2018 + (p1.id % 5), month: 1, day: 1}),
-                relationship: 'Colleague'
-            }]->(p2)
-        """)
-        console.print("[green]Social connections created successfully[/green]\n")
+        # Create all relationships in one transaction (after all nodes exist — helps
+        # CDC ordering), so they reach Kafka Connect as a single commit
+        console.print("[bold blue]Creating WORKS_AT and KNOWS relationships...[/bold blue]")
+        client.execute_write_batch([
+            # Resolve the companies once into an id-ordered list instead of probing the
+            # company index per person; companies[i] is the Company with id i + 1
+            ("""
+                MATCH (company:Company)
+                WITH company ORDER BY company.id
+                WITH collect(company) AS companies
+                UNWIND $rels AS rel
+                MATCH (p:Person {id: rel.person})
+                WITH p, rel, companies[rel.company - 1] AS c
+                CREATE (p)-[r:WORKS_AT]->(c)
+                SET r = rel.properties
+            """, {"rels": build_works_at()}),
+            ("""
+                UNWIND $rels AS rel
+                MATCH (p1:Person {id: rel.from}), (p2:Person {id: rel.to})
+                CREATE (p1)-[r:KNOWS]->(p2)
+                SET r = rel.properties
+            """, {"rels": build_knows()}),
+        ])
+        console.print("[green]Relationships created successfully[/green]\n")
 
         # Get statistics
         node_count = client.get_node_count()
@@ -139,18 +186,23 @@ def main():
         label_counts = client.get_label_counts()
 
         # Display summary table
-        table = Table(title="Source Database Summary")
-        table.add_column("Metric", style="cyan", no_wrap=True)
-        table.add_column("Count", style="magenta")
-
-        table.add_row("Total Nodes", str(node_count))
-        table.add_row("Total Relationships", str(rel_count))
-        table.add_row("", "")  # Separator
-
+        rows = [
+            ("Total Nodes", str(node_count)),
+            ("Total Relationships", str(rel_count)),
+            ("", ""),  # Separator
+        ]
         for label, count in label_counts.items():
-            table.add_row(f"{label} Nodes", str(count))
-
-        console.print(table)
+            rows.append((f"{label} Nodes", str(count)))
+
+        print_table(
+            console,
+            "Source Database Summary",
+            [
+                {"header": "Metric", "style": "cyan", "no_wrap": True},
+                {"header": "Count", "style": "magenta"},
+            ],
+            rows,
+        )
         console.print("\n[bold green]Master graph initialized successfully![/bold green]")
         console.print("[bold yellow]CDC will now capture all changes to this database.[/bold yellow]")
 
@@ -15,13 +15,17 @@ Environment variables:
     NEO4J_PASSWORD     - password for the source database
     NEO4J_USERNAME     - username (default: neo4j)
     HEARTBEAT_INTERVAL - seconds between heartbeats (default: 30)
+
+    NEO4J_MAX_CONNECTION_POOL_SIZE     - driver pool size (default: 50)
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT - seconds to wait for a pooled connection (default: 30)
+    NEO4J_MAX_CONNECTION_LIFETIME      - seconds before a connection is recycled (default: 180)
 """
 
 import logging
 import os
 import signal
 import sys
-import time
+import threading
 
 from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable, SessionExpired
@@ -33,34 +37,64 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
-SHUTDOWN = False
+HEARTBEAT_ID = "cdc-pipeline"
+HEARTBEAT_QUERY = (
+    "MERGE (h:_Heartbeat {id: $id}) "
+    "SET h.ts = datetime(), h.seq = COALESCE(h.seq, 0) + 1"
+)
+
+SHUTDOWN = threading.Event()
 
 
 def handle_signal(signum, frame):
-    global SHUTDOWN
     log.info("Shutdown signal received, exiting...")
-    SHUTDOWN = True
+    SHUTDOWN.set()
 
 
 signal.signal(signal.SIGTERM, handle_signal)
 signal.signal(signal.SIGINT, handle_signal)
 
 
-def send_heartbeat(driver) -> bool:
-    """Write a heartbeat node to the source database. Returns True on success."""
+def driver_settings() -> dict:
+    """Connection pool settings for GraphDatabase.driver.
+
+    Each value can be overridden with an environment variable. Pooled Bolt
+    connections are retired after 180s, before load balancers or NAT on the
+    path to Aura drop them for being idle.
+
+    Same settings as python/utils/neo4j_client.driver_settings (this image
+    ships without that package); keep the two in sync.
+    """
+    return {
+        "max_connection_pool_size": int(os.environ.get("NEO4J_MAX_CONNECTION_POOL_SIZE", "50")),
+        "connection_acquisition_timeout": float(
+            os.environ.get("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30")
+        ),
+        "max_connection_lifetime": float(os.environ.get("NEO4J_MAX_CONNECTION_LIFETIME", "180")),
+        "keep_alive": True,
+    }
+
+
+def close_quietly(resource) -> None:
+    """Close a session or driver, ignoring errors from an already-broken connection."""
     try:
-        with driver.session() as session:
-            session.run(
-                "MERGE (h:_Heartbeat {id: 'cdc-pipeline'}) "
-                "SET h.ts = datetime(), h.seq = COALESCE(h.seq, 0) + 1"
-            ).consume()
-        return True
-    except (ServiceUnavailable, SessionExpired) as e:
-        log.warning("Neo4j connection issue: %s", e)
-        return False
-    except Exception as e:
-        log.error("Heartbeat failed: %s", e)
-        return False
+        resource.close()
+    except Exception:
+        pass
+
+
+def _do_heartbeat(tx) -> None:
+    tx.run(HEARTBEAT_QUERY, id=HEARTBEAT_ID).consume()
+
+
+def send_heartbeat(session) -> None:
+    """Write a heartbeat node to the source database.
+
+    Runs as a managed transaction so the driver retries transient errors and
+    leader switches itself. Connection errors that outlast the driver's retry
+    window propagate to the caller.
+    """
+    session.execute_write(_do_heartbeat)
 
 
 def main():
@@ -75,7 +109,7 @@ def main():
 
     log.info("Starting CDC heartbeat (interval=%ds, target=%s)", interval, uri)
 
-    driver = GraphDatabase.driver(uri, auth=(username, password))
+    driver = GraphDatabase.driver(uri, auth=(username, password), **driver_settings())
 
     # Verify connectivity before entering loop
     try:
@@ -85,40 +119,46 @@ def main():
         log.error("Cannot connect to Neo4j: %s", e)
         sys.exit(1)
 
+    # One long-lived session for the whole loop; it is only reopened after a failure
+    session = driver.session()
+    # Each failure has already survived the driver's own retries, so a few in a
+    # row means the pool is wedged and the driver should be rebuilt
     consecutive_failures = 0
-    max_failures = 10
+    max_failures = 3
 
     try:
-        while not SHUTDOWN:
-            if send_heartbeat(driver):
+        while not SHUTDOWN.is_set():
+            try:
+                send_heartbeat(session)
                 consecutive_failures = 0
                 log.info("Heartbeat sent")
-            else:
+            except (ServiceUnavailable, SessionExpired) as e:
                 consecutive_failures += 1
                 log.warning(
-                    "Heartbeat failed (%d/%d consecutive)",
+                    "Neo4j connection issue (%d/%d consecutive): %s",
                     consecutive_failures,
                     max_failures,
+                    e,
                 )
+                close_quietly(session)
                 if consecutive_failures >= max_failures:
                     log.error(
                         "Too many consecutive failures, reconnecting..."
                     )
-                    try:
-                        driver.close()
-                    except Exception:
-                        pass
+                    close_quietly(driver)
                     driver = GraphDatabase.driver(
-                        uri, auth=(username, password)
+                        uri, auth=(username, password), **driver_settings()
                     )
                     consecutive_failures = 0
+                session = driver.session()
+            except Exception as e:
+                log.error("Heartbeat failed: %s", e)
 
-            # Sleep in small increments so we respond to SIGTERM quickly
-            for _ in range(interval):
-                if SHUTDOWN:
-                    break
-                time.sleep(1)
+            # Returns as soon as a shutdown signal sets the event
+            if SHUTDOWN.wait(timeout=interval):
+                break
     finally:
+        close_quietly(session)
         driver.close()
         log.info("Heartbeat stopped")
 
@@ -15,18 +15,31 @@ Exit codes:
     1 - One or more checks failed
 """
 
+import io
+import mmap
+import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Callable
 
 from rich.console import Console
 
 console = Console()
 
+# Uncommented `name = "value"` assignments of the Aura credentials in terraform.tfvars
+TFVARS_CREDENTIAL = re.compile(
+    rb'^\s*(aura_client_id|aura_client_secret|aura_tenant_id)\s*=\s*"([^"]*)"', re.MULTILINE
+)
+PLACEHOLDER_VALUE = re.compile(rb"your-|xxx|change[-_]?me|placeholder", re.IGNORECASE)
 
-def check_azure_cli() -> bool:
+
+def check_azure_cli(out: Console = console) -> bool:
     """Check if Azure CLI is authenticated."""
-    console.print("[blue]Checking Azure CLI authentication...[/blue]")
+    out.print("[blue]Checking Azure CLI authentication...[/blue]")
     try:
         result = subprocess.run(
             ["az", "account", "show", "--query", "name", "-o", "tsv"],
@@ -35,46 +48,53 @@ def check_azure_cli() -> bool:
             timeout=30
         )
         if result.returncode == 0 and result.stdout.strip():
-            console.print(f"[green]✓ Azure CLI authenticated (Account: {result.stdout.strip()})[/green]")
+            out.print(f"[green]✓ Azure CLI authenticated (Account: {result.stdout.strip()})[/green]")
             return True
         else:
-            console.print("[red]✗ Azure CLI not authenticated[/red]")
-            console.print("[dim]  Run: az login[/dim]")
+            out.print("[red]✗ Azure CLI not authenticated[/red]")
+            out.print("[dim]  Run: az login[/dim]")
             return False
     except FileNotFoundError:
-        console.print("[red]✗ Azure CLI not installed[/red]")
-        console.print("[dim]  Install from: https://learn.microsoft.com/cli/azure/install-azure-cli[/dim]")
+        out.print("[red]✗ Azure CLI not installed[/red]")
+        out.print("[dim]  Install from: https://learn.microsoft.com/cli/azure/install-azure-cli[/dim]")
         return False
     except subprocess.TimeoutExpired:
-        console.print("[red]✗ Azure CLI timed out[/red]")
+        out.print("[red]✗ Azure CLI timed out[/red]")
         return False
 
 
-def check_python_dependencies() -> bool:
+def check_python_dependencies(out: Console = console) -> bool:
     """Check if required Python packages are available."""
-    console.print("[blue]Checking Python dependencies...[/blue]")
+    out.print("[blue]Checking Python dependencies...[/blue]")
     required = ["rich", "neo4j", "requests"]
-    missing = []
-
-    for pkg in required:
-        try:
-            __import__(pkg)
-        except ImportError:
-            missing.append(pkg)
+    # find_spec locates the package without executing it, so no import-time side effects
+    missing = [pkg for pkg in required if find_spec(pkg) is None]
 
     if not missing:
-        console.print(f"[green]✓ Python dependencies available ({', '.join(required)})[/green]")
+        out.print(f"[green]✓ Python dependencies available ({', '.join(required)})[/green]")
         return True
     else:
-        console.print(f"[red]✗ Missing Python packages: {', '.join(missing)}[/red]")
-        console.print("[dim]  Activate conda environment: conda activate neo4j-cdc-sync[/dim]")
-        console.print("[dim]  Or create it: conda env create -f environment.yml[/dim]")
+        out.print(f"[red]✗ Missing Python packages: {', '.join(missing)}[/red]")
+        out.print("[dim]  Activate conda environment: conda activate neo4j-cdc-sync[/dim]")
+        out.print("[dim]  Or create it: conda env create -f environment.yml[/dim]")
         return False
 
 
-def check_terraform_config() -> bool:
+def read_tfvars_credentials(tfvars_path: Path) -> dict[str, bytes]:
+    """Scan a tfvars file for Aura credential assignments without decoding it."""
+    with open(tfvars_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {
+                match.group(1).decode(): match.group(2)
+                for match in TFVARS_CREDENTIAL.finditer(mm)
+            }
+
+
+def check_terraform_config(out: Console = console) -> bool:
     """Check if terraform.tfvars exists and has Aura credentials."""
-    console.print("[blue]Checking Terraform configuration...[/blue]")
+    out.print("[blue]Checking Terraform configuration...[/blue]")
 
     # Find terraform.tfvars relative to this script or repo root
     script_dir = Path(__file__).parent
@@ -82,40 +102,36 @@ def check_terraform_config() -> bool:
     tfvars_path = repo_root / "terraform" / "terraform.tfvars"
 
     if not tfvars_path.exists():
-        console.print("[red]✗ terraform/terraform.tfvars not found[/red]")
-        console.print("[dim]  Copy template: cp terraform/terraform.tfvars.example terraform/terraform.tfvars[/dim]")
-        console.print("[dim]  Then edit and add your Aura API credentials[/dim]")
+        out.print("[red]✗ terraform/terraform.tfvars not found[/red]")
+        out.print("[dim]  Copy template: cp terraform/terraform.tfvars.example terraform/terraform.tfvars[/dim]")
+        out.print("[dim]  Then edit and add your Aura API credentials[/dim]")
         return False
 
     # Check for required Aura credentials
-    content = tfvars_path.read_text()
     required_vars = ["aura_client_id", "aura_client_secret", "aura_tenant_id"]
-    missing = []
-    placeholder = []
-
-    for var in required_vars:
-        if var not in content:
-            missing.append(var)
-        elif f'{var} = ""' in content or "your-client-id" in content:
-            placeholder.append(var)
+    values = read_tfvars_credentials(tfvars_path)
+    missing = [var for var in required_vars if var not in values]
+    placeholder = [
+        var for var, value in values.items() if not value or PLACEHOLDER_VALUE.search(value)
+    ]
 
     if missing:
-        console.print(f"[red]✗ Missing variables in terraform.tfvars: {', '.join(missing)}[/red]")
+        out.print(f"[red]✗ Missing variables in terraform.tfvars: {', '.join(missing)}[/red]")
         return False
 
     if placeholder:
-        console.print("[red]✗ Aura credentials appear to be placeholder values[/red]")
-        console.print("[dim]  Edit terraform/terraform.tfvars and set actual values[/dim]")
-        console.print("[dim]  Get credentials from: https://console.neo4j.io → Account → API Keys[/dim]")
+        out.print("[red]✗ Aura credentials appear to be placeholder values[/red]")
+        out.print("[dim]  Edit terraform/terraform.tfvars and set actual values[/dim]")
+        out.print("[dim]  Get credentials from: https://console.neo4j.io → Account → API Keys[/dim]")
         return False
 
-    console.print("[green]✓ terraform.tfvars found with Aura credentials[/green]")
+    out.print("[green]✓ terraform.tfvars found with Aura credentials[/green]")
     return True
 
 
-def check_terraform_installed() -> bool:
+def check_terraform_installed(out: Console = console) -> bool:
     """Check if Terraform is installed."""
-    console.print("[blue]Checking Terraform...[/blue]")
+    out.print("[blue]Checking Terraform...[/blue]")
     try:
         result = subprocess.run(
             ["terraform", "version", "-json"],
@@ -130,20 +146,32 @@ def check_terraform_installed() -> bool:
                 version = version_info.get("terraform_version", "unknown")
             except json.JSONDecodeError:
                 version = "unknown"
-            console.print(f"[green]✓ Terraform installed (version {version})[/green]")
+            out.print(f"[green]✓ Terraform installed (version {version})[/green]")
             return True
         else:
-            console.print("[red]✗ Terraform not working properly[/red]")
+            out.print("[red]✗ Terraform not working properly[/red]")
             return False
     except FileNotFoundError:
-        console.print("[red]✗ Terraform not installed[/red]")
-        console.print("[dim]  Install from: https://developer.hashicorp.com/terraform/install[/dim]")
+        out.print("[red]✗ Terraform not installed[/red]")
+        out.print("[dim]  Install from: https://developer.hashicorp.com/terraform/install[/dim]")
         return False
     except subprocess.TimeoutExpired:
-        console.print("[red]✗ Terraform timed out[/red]")
+        out.print("[red]✗ Terraform timed out[/red]")
         return False
 
 
+def run_buffered(check: Callable[[Console], bool]) -> tuple[bool, str]:
+    """Run a check against a private console and return its result and rendered output."""
+    buffer = io.StringIO()
+    out = Console(
+        file=buffer,
+        force_terminal=console.is_terminal,
+        color_system=console.color_system,
+        width=console.width,
+    )
+    return check(out), buffer.getvalue()
+
+
 def main() -> int:
     """Run all pre-flight checks."""
     console.print()
@@ -158,7 +186,16 @@ def main() -> int:
         check_terraform_config,
     ]
 
-    results = [check() for check in checks]
+    # The checks are mostly subprocess/network waits, so run them concurrently and
+    # replay each one's buffered output in the original order
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        outcomes = list(executor.map(run_buffered, checks))
+
+    results = []
+    for passed, output in outcomes:
+        console.file.write(output)
+        results.append(passed)
+    console.file.flush()
     all_passed = all(results)
 
     console.print()
@@ -19,38 +19,64 @@ Usage:
 """
 
 import os
+import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from rich.console import Console
-from utils.neo4j_client import Neo4jClient
+from utils.console import make_console
+from utils.neo4j_client import Neo4jClient, check_connections
 
 # Add generators to path so we can import social_network directly
 _generators_path = Path(__file__).parent.parent / "generators"
 if str(_generators_path) not in sys.path:
     sys.path.insert(0, str(_generators_path))
 
-console = Console()
+console = make_console()
 
 # Expected counts from social_network.py
 EXPECTED_NODES = 110       # 10 Company + 100 Person
 EXPECTED_RELS = 445        # 100 WORKS_AT + 345 KNOWS
 PROPAGATION_TIMEOUT = 180  # 3 minutes max for bulk propagation
+CLEAR_TIMEOUT = 30         # Max wait for CDC to propagate the source deletes
+
+# The heartbeat sidecar re-creates its _Heartbeat node on the source, so it is
+# not part of the deletes being waited for
+DATA_NODE_COUNT_QUERY = "MATCH (n) WHERE NOT n:_Heartbeat RETURN count(n)"
+
+# Set on SIGTERM while waiting for propagation, so the poll wait wakes immediately
+SHUTDOWN = threading.Event()
+
+
+def exit_if_terminated() -> None:
+    """Exit with the conventional SIGTERM status once SIGTERM has been received."""
+    if SHUTDOWN.is_set():
+        console.print("\n[yellow]Test terminated[/yellow]")
+        sys.exit(128 + signal.SIGTERM)
+
+
+def wait_or_exit(seconds: float) -> None:
+    """Sleep between polls, exiting immediately if SIGTERM arrives."""
+    SHUTDOWN.wait(seconds)
+    exit_if_terminated()
 
 
 def clear_databases(source: Neo4jClient, target: Neo4jClient) -> None:
     """Clear all nodes and relationships from both databases."""
     console.print("[dim]Clearing existing data from both databases...[/dim]")
 
-    # Clear source
-    source.execute_write("MATCH (n) DETACH DELETE n")
+    # Clear source; CDC propagates the deletes to the target
+    source.clear_database()
 
-    # Wait briefly for CDC to propagate deletes
-    time.sleep(2)
-
-    # Clear target (in case CDC delete propagation is slow or incomplete)
-    target.execute_write("MATCH (n) DETACH DELETE n")
+    start = time.time()
+    while target.fetch_scalar(DATA_NODE_COUNT_QUERY) > 0:
+        if time.time() - start >= CLEAR_TIMEOUT:
+            # Delete propagation is slow or incomplete - clear the target directly
+            target.clear_database()
+            break
+        time.sleep(0.5)
 
     console.print("[dim]  Done.[/dim]\n")
 
@@ -68,22 +94,38 @@ def run_social_network_generator() -> bool:
     except ImportError as e:
         console.print(f"[red]Error: Could not import social_network generator: {e}[/red]")
         return False
+    except SystemExit as e:
+        # main() calls sys.exit() on failure; treat it like a subprocess exit code
+        if e.code in (None, 0):
+            console.print("[green]Generator completed successfully[/green]\n")
+            return True
+        console.print(f"[red]Generator exited with status {e.code}[/red]")
+        return False
     except Exception as e:
         console.print(f"[red]Error running generator: {e}[/red]")
         return False
 
 
-def check_counts(source: Neo4jClient, target: Neo4jClient) -> tuple[bool, dict]:
+def check_counts(
+    source: Neo4jClient, target: Neo4jClient, executor: ThreadPoolExecutor
+) -> tuple[bool, dict]:
     """
-    Check node and relationship counts on both databases.
+    Check node and relationship counts on both databases concurrently.
+
+    The executor is reused across polls, so its threads keep their cached
+    sessions instead of opening new ones each time.
 
     Returns:
         (all_match, counts_dict)
     """
-    source_nodes = source.get_node_count()
-    source_rels = source.get_relationship_count()
-    target_nodes = target.get_node_count()
-    target_rels = target.get_relationship_count()
+    source_future = executor.submit(source.get_counts)
+    target_future = executor.submit(target.get_counts)
+    source_counts = source_future.result()
+    target_counts = target_future.result()
+    source_nodes = source_counts["nodes"]
+    source_rels = source_counts["relationships"]
+    target_nodes = target_counts["nodes"]
+    target_rels = target_counts["relationships"]
 
     counts = {
         "source_nodes": source_nodes,
@@ -115,27 +157,33 @@ def wait_for_propagation(source: Neo4jClient, target: Neo4jClient) -> tuple[bool
 
     start = time.time()
     last_status = start
-    poll_interval = 10  # Check every 10 seconds
+    # Back off from 0.5s to 10s so a fast replication is noticed almost immediately
+    # without hammering the databases during a slow one
+    poll_interval = 0.5
+    max_poll_interval = 10.0
 
-    while True:
-        elapsed = time.time() - start
-        success, counts = check_counts(source, target)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        while True:
+            elapsed = time.time() - start
+            success, counts = check_counts(source, target, executor)
 
-        if success:
-            return True, counts, elapsed
+            if success:
+                return True, counts, elapsed
 
-        if elapsed >= PROPAGATION_TIMEOUT:
-            return False, counts, elapsed
+            if elapsed >= PROPAGATION_TIMEOUT:
+                return False, counts, elapsed
 
-        # Print status update every 30 seconds
-        if time.time() - last_status >= 30:
-            console.print(
-                f"[dim]  {int(elapsed)}s: target has {counts['target_nodes']} nodes, "
-                f"{counts['target_rels']} rels (waiting for {EXPECTED_NODES}/{EXPECTED_RELS})...[/dim]"
-            )
-            last_status = time.time()
+            # Print status update every 30 seconds
+            if time.time() - last_status >= 30:
+                console.print(
+                    f"[dim]  {int(elapsed)}s: target has {counts['target_nodes']} nodes, "
+                    f"{counts['target_rels']} rels "
+                    f"(waiting for {EXPECTED_NODES}/{EXPECTED_RELS})...[/dim]"
+                )
+                last_status = time.time()
 
-        time.sleep(poll_interval)
+            wait_or_exit(poll_interval)
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
 
 
 def main() -> int:
@@ -182,6 +230,12 @@ def main() -> int:
         console.print(f"[bold red]Error connecting to databases: {e}[/bold red]")
         return 1
 
+    if not check_connections(source, target):
+        console.print("[bold red]Error connecting to databases[/bold red]")
+        source.close()
+        target.close()
+        return 1
+
     console.print("[green]Connected to both databases[/green]\n")
 
     try:
@@ -197,7 +251,12 @@ def main() -> int:
 
         # Step 3: Wait for propagation
         console.print("[bold blue]Step 3: Verifying CDC propagation...[/bold blue]")
-        success, counts, elapsed = wait_for_propagation(source, target)
+        # Only the polling phase handles SIGTERM itself; elsewhere it keeps its default
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: SHUTDOWN.set())
+        try:
+            success, counts, elapsed = wait_for_propagation(source, target)
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
 
         # Print final results
         console.print()
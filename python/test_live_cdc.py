@@ -17,36 +17,254 @@ Usage:
 """
 
 import os
+import queue
 import sys
 import time
-from typing import Callable
-from rich.console import Console
-from utils.neo4j_client import Neo4jClient
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from utils.cdc_utils import CdcWatcher, get_cdc_cursor, is_node_event
+from utils.console import make_console
+from utils.neo4j_client import Neo4jClient, check_connections
 
-console = Console()
+console = make_console()
 
 PROPAGATION_TIMEOUT = 90
+CAPTURE_TIMEOUT = 10  # Max wait for an event to appear in the source CDC log
+
+# One test node per event type so the tests can run concurrently
+CREATE_TEST_ID = 9991
+UPDATE_TEST_ID = 9992
+DELETE_TEST_ID = 9993
+TEST_IDS = [CREATE_TEST_ID, UPDATE_TEST_ID, DELETE_TEST_ID]
+
+TEST_NAME = "CDC Test User"
+UPDATED_NAME = "Updated CDC User"
+
+# Takes a list of ids so several test nodes are written in one transaction
+CREATE_NODES_QUERY = """
+    UNWIND $ids AS id
+    MERGE (p:Person {id: id})
+    SET p.name = $name, p.email = 'cdc@test.com', p.testRun = timestamp()
+"""
+UPDATE_NODE_QUERY = "MATCH (p:Person {id: $id}) SET p.name = $name, p.lastModified = timestamp()"
+DELETE_NODE_QUERY = "MATCH (p:Person {id: $id}) DELETE p"
+DELETE_TEST_NODES_QUERY = "MATCH (p:Person) WHERE p.id IN $ids DELETE p"
+NODES_ABSENT_QUERY = "RETURN NOT exists { MATCH (p:Person) WHERE p.id IN $ids } AS ok"
+# Every target probe looks nodes up by id; without an index each poll scans all
+# of :Person. Target only: on the source, the generator's person_id uniqueness
+# constraint cannot be created over an existing index on the same property.
+PERSON_ID_INDEX_QUERY = "CREATE INDEX person_id_idx IF NOT EXISTS FOR (p:Person) ON (p.id)"
+NODE_EXISTS_QUERY = "RETURN exists { MATCH (p:Person {id: $id}) } AS ok"
+NODE_ABSENT_QUERY = "RETURN NOT exists { MATCH (p:Person {id: $id}) } AS ok"
+CREATE_CHECK_QUERY = """
+    MATCH (p:Person {id: $id})
+    WITH collect(p {.name, .email}) AS nodes
+    RETURN any(n IN nodes WHERE n.name = $name) AS ok, nodes
+"""
+UPDATE_CHECK_QUERY = """
+    MATCH (p:Person {id: $id})
+    WITH collect(p.name) AS names
+    RETURN size(names) > 0 AND all(n IN names WHERE n = $name) AS ok, names
+"""
 
 
 def wait_for_condition(
     check_fn: Callable[[], bool],
     timeout_seconds: float = PROPAGATION_TIMEOUT,
-    poll_interval_seconds: float = 0.5
+    initial_interval_seconds: float = 0.05,
+    max_interval_seconds: float = 1.0
 ) -> tuple[bool, float]:
     """
     Poll until check_fn returns True or timeout.
 
+    The interval grows by 1.5x from initial_interval_seconds up to
+    max_interval_seconds, so fast propagation is seen almost immediately
+    while slow propagation does not hammer the subscriber.
+
     Returns:
         (success, elapsed_seconds) - success is True if condition was met
     """
     start = time.time()
+    interval = initial_interval_seconds
     while True:
         elapsed = time.time() - start
         if check_fn():
             return True, elapsed
         if elapsed >= timeout_seconds:
             return False, elapsed
-        time.sleep(poll_interval_seconds)
+        time.sleep(min(interval, timeout_seconds - elapsed))
+        interval = min(interval * 1.5, max_interval_seconds)
+
+
+class Probe:
+    """
+    Polling predicate evaluated on the server.
+
+    The query returns a boolean column named ok, plus any columns needed to
+    report the outcome. The last row is kept in last_result, so reporting
+    needs no second query.
+    """
+
+    def __init__(self, client: Neo4jClient, query: str, parameters: Optional[dict] = None):
+        self.client = client
+        self.query = query
+        self.parameters = parameters
+        self.last_result: Optional[dict] = None
+
+    def __call__(self) -> bool:
+        result = self.client.poll_read(self.query, self.parameters)
+        if result is None:
+            return False
+        self.last_result = result[0] if result else None
+        return bool(self.last_result and self.last_result["ok"])
+
+
+def watch_source(source: Neo4jClient, operation: str, node_id: int) -> CdcWatcher:
+    """
+    Start following the source CDC log for a change that is about to be made.
+
+    Runs while the target is polled, so if propagation fails it is already
+    known whether the source captured the change.
+    """
+    watcher = CdcWatcher(
+        source,
+        get_cdc_cursor(source),
+        lambda e: is_node_event(e, operation, node_id),
+        timeout_seconds=PROPAGATION_TIMEOUT + CAPTURE_TIMEOUT,
+    )
+    watcher.start()
+    return watcher
+
+
+def explain_failure(watcher: CdcWatcher, out: list[str]) -> None:
+    """Report whether a change that never reached the target was captured on the source."""
+    try:
+        change_id, _ = watcher.events.get(timeout=CAPTURE_TIMEOUT)
+    except queue.Empty:
+        if watcher.error is not None:
+            out.append(f"  [dim]Could not read source CDC log: {watcher.error}[/dim]")
+        else:
+            out.append("  Source CDC log has no matching event - the change was not captured")
+        return
+    out.append(f"  Source captured the change ({change_id}) - delivery to the target stalled")
+
+
+def run_create_test(source: Neo4jClient, target: Neo4jClient, node_id: int, out: list[str]) -> bool:
+    """Create a node on the source and wait for it on the target."""
+    out.append("[bold cyan]Test 1: CREATE Event[/bold cyan]")
+    out.append("Creating new node in master graph...")
+
+    watcher = None
+    try:
+        try:
+            watcher = watch_source(source, "c", node_id)
+            source.execute_write(CREATE_NODES_QUERY, {"ids": [node_id], "name": TEST_NAME})
+            out.append("[green]✓ Node created in source[/green]")
+        except Exception as e:
+            out.append(f"[red]✗ Failed to create node: {e}[/red]")
+            return False
+
+        out.append("Waiting for CDC propagation...")
+
+        check_create = Probe(target, CREATE_CHECK_QUERY, {"id": node_id, "name": TEST_NAME})
+        success, elapsed = wait_for_condition(check_create)
+        if success:
+            out.append(f"[bold green]✓ CREATE event propagated in {elapsed:.1f}s[/bold green]")
+            out.append(f"  Found: {check_create.last_result['nodes'][0]}")
+            return True
+
+        out.append(
+            f"[bold red]✗ CREATE event failed - node not found after {elapsed:.1f}s[/bold red]"
+        )
+        explain_failure(watcher, out)
+        return False
+    finally:
+        # Don't leave the watcher polling the source after main() closes it
+        if watcher is not None:
+            watcher.stop()
+
+
+def wait_for_test_node(target: Neo4jClient, node_id: int, out: list[str]) -> bool:
+    """Wait until a test node seeded by main() exists on the target."""
+    success, elapsed = wait_for_condition(Probe(target, NODE_EXISTS_QUERY, {"id": node_id}))
+    if not success:
+        out.append(f"[red]✗ Test node not replicated after {elapsed:.1f}s[/red]")
+    return success
+
+
+def run_update_test(source: Neo4jClient, target: Neo4jClient, node_id: int, out: list[str]) -> bool:
+    """Update a replicated node on the source and wait for the change on the target."""
+    out.append("[bold cyan]Test 2: UPDATE Event[/bold cyan]")
+    if not wait_for_test_node(target, node_id, out):
+        return False
+
+    out.append("Updating node property in master graph...")
+
+    watcher = None
+    try:
+        try:
+            watcher = watch_source(source, "u", node_id)
+            source.execute_write(UPDATE_NODE_QUERY, {"id": node_id, "name": UPDATED_NAME})
+            out.append("[green]✓ Node updated in source[/green]")
+        except Exception as e:
+            out.append(f"[red]✗ Failed to update node: {e}[/red]")
+            return False
+
+        out.append("Waiting for CDC propagation...")
+
+        check_update = Probe(target, UPDATE_CHECK_QUERY, {"id": node_id, "name": UPDATED_NAME})
+        success, elapsed = wait_for_condition(check_update)
+        names = check_update.last_result["names"] if check_update.last_result else []
+        if success:
+            out.append(f"[bold green]✓ UPDATE event propagated in {elapsed:.1f}s[/bold green]")
+            out.append(f"  Updated name: {names[0]}")
+            return True
+
+        out.append(f"[bold red]✗ UPDATE event failed after {elapsed:.1f}s[/bold red]")
+        out.append(f"  Expected: '{UPDATED_NAME}', Got: {names[0] if names else 'NOT FOUND'}")
+        explain_failure(watcher, out)
+        return False
+    finally:
+        # Don't leave the watcher polling the source after main() closes it
+        if watcher is not None:
+            watcher.stop()
+
+
+def run_delete_test(source: Neo4jClient, target: Neo4jClient, node_id: int, out: list[str]) -> bool:
+    """Delete a replicated node on the source and wait for it to disappear from the target."""
+    out.append("[bold cyan]Test 3: DELETE Event[/bold cyan]")
+    if not wait_for_test_node(target, node_id, out):
+        return False
+
+    out.append("Deleting node from master graph...")
+
+    watcher = None
+    try:
+        try:
+            watcher = watch_source(source, "d", node_id)
+            source.execute_write(DELETE_NODE_QUERY, {"id": node_id})
+            out.append("[green]✓ Node deleted from source[/green]")
+        except Exception as e:
+            out.append(f"[red]✗ Failed to delete node: {e}[/red]")
+            return False
+
+        out.append("Waiting for CDC propagation...")
+
+        success, elapsed = wait_for_condition(Probe(target, NODE_ABSENT_QUERY, {"id": node_id}))
+        if success:
+            out.append(f"[bold green]✓ DELETE event propagated in {elapsed:.1f}s[/bold green]")
+            out.append("  Node no longer exists in target")
+            return True
+
+        out.append(
+            f"[bold red]✗ DELETE event failed - node still exists after {elapsed:.1f}s[/bold red]"
+        )
+        explain_failure(watcher, out)
+        return False
+    finally:
+        # Don't leave the watcher polling the source after main() closes it
+        if watcher is not None:
+            watcher.stop()
 
 
 def main():
@@ -69,124 +287,73 @@ def main():
         console.print(f"[bold red]Error connecting to databases: {e}[/bold red]")
         sys.exit(1)
 
+    if not check_connections(source, target):
+        console.print("[bold red]Error connecting to databases[/bold red]")
+        source.close()
+        target.close()
+        sys.exit(1)
+
     console.print("[green]✓ Connected to both databases[/green]\n")
 
+    try:
+        target.execute_write(PERSON_ID_INDEX_QUERY)
+    except Exception as e:
+        console.print(f"[yellow]Warning: could not index Person(id) on target: {e}[/yellow]")
+
     # Clean up any leftover test nodes from previous runs
     console.print("[dim]Cleaning up leftover test data...[/dim]")
-    source.execute_write("MATCH (p:Person {id: 9999}) DELETE p")
+    source.execute_write(DELETE_TEST_NODES_QUERY, {"ids": TEST_IDS})
 
-    def check_cleanup():
-        try:
-            result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p")
-            return len(result) == 0
-        except Exception:
-            return False
+    check_cleanup = Probe(target, NODES_ABSENT_QUERY, {"ids": TEST_IDS})
 
     # Don't wait long for cleanup - it's just best-effort
     if not check_cleanup():
         wait_for_condition(check_cleanup, timeout_seconds=10)
     console.print("[dim]  Done.[/dim]\n")
 
-    # Test 1: CREATE event
-    console.print("[bold cyan]Test 1: CREATE Event[/bold cyan]")
-    console.print("Creating new node in master graph...")
-
+    # The UPDATE and DELETE tests need an existing node; seed both in one write
     try:
         source.execute_write(
-            "MERGE (p:Person {id: 9999}) SET p.name = 'CDC Test User', p.email = 'cdc@test.com', p.testRun = timestamp()"
+            CREATE_NODES_QUERY,
+            {"ids": [UPDATE_TEST_ID, DELETE_TEST_ID], "name": TEST_NAME},
         )
-        console.print("[green]✓ Node created in source[/green]")
-    except Exception as e:
-        console.print(f"[red]✗ Failed to create node: {e}[/red]")
-        sys.exit(1)
-
-    console.print("Waiting for CDC propagation...")
-
-    def check_create():
-        try:
-            result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p.name as name, p.email as email")
-            return len(result) >= 1 and result[0]["name"] == "CDC Test User"
-        except Exception:
-            return False
-
-    success, elapsed = wait_for_condition(check_create)
-    if success:
-        result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p.name as name, p.email as email")
-        console.print(f"[bold green]✓ CREATE event propagated in {elapsed:.1f}s[/bold green]")
-        console.print(f"  Found: {result[0]}")
-    else:
-        console.print(f"[bold red]✗ CREATE event failed - node not found after {elapsed:.1f}s[/bold red]")
-        sys.exit(1)
-
-    console.print()
-
-    # Test 2: UPDATE event
-    console.print("[bold cyan]Test 2: UPDATE Event[/bold cyan]")
-    console.print("Updating node property in master graph...")
-
-    try:
-        source.execute_write("MATCH (p:Person {id: 9999}) SET p.name = 'Updated CDC User', p.lastModified = timestamp()")
-        console.print("[green]✓ Node updated in source[/green]")
     except Exception as e:
-        console.print(f"[red]✗ Failed to update node: {e}[/red]")
-        sys.exit(1)
-
-    console.print("Waiting for CDC propagation...")
-
-    def check_update():
-        try:
-            result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p.name as name")
-            return len(result) >= 1 and all(r["name"] == "Updated CDC User" for r in result)
-        except Exception:
-            return False
-
-    success, elapsed = wait_for_condition(check_update)
-    if success:
-        result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p.name as name")
-        console.print(f"[bold green]✓ UPDATE event propagated in {elapsed:.1f}s[/bold green]")
-        console.print(f"  Updated name: {result[0]['name']}")
-    else:
-        result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p.name as name")
-        console.print(f"[bold red]✗ UPDATE event failed after {elapsed:.1f}s[/bold red]")
-        console.print(f"  Expected: 'Updated CDC User', Got: {result[0]['name'] if result else 'NOT FOUND'}")
+        console.print(f"[bold red]Failed to create test nodes: {e}[/bold red]")
+        source.close()
+        target.close()
         sys.exit(1)
 
-    console.print()
+    # Each event type uses its own node, so the three tests can wait on
+    # propagation concurrently; output is buffered and printed in test order
+    console.print("[dim]Running CREATE, UPDATE and DELETE tests concurrently...[/dim]\n")
+    tests = [
+        (run_create_test, CREATE_TEST_ID),
+        (run_update_test, UPDATE_TEST_ID),
+        (run_delete_test, DELETE_TEST_ID),
+    ]
+    outputs: list[list[str]] = [[] for _ in tests]
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [
+            executor.submit(test, source, target, node_id, out)
+            for (test, node_id), out in zip(tests, outputs)
+        ]
+        results = [future.result() for future in futures]
+
+    for out in outputs:
+        for line in out:
+            console.print(line)
+        console.print()
 
-    # Test 3: DELETE event
-    console.print("[bold cyan]Test 3: DELETE Event[/bold cyan]")
-    console.print("Deleting node from master graph...")
-
-    try:
-        source.execute_write("MATCH (p:Person {id: 9999}) DELETE p")
-        console.print("[green]✓ Node deleted from source[/green]")
-    except Exception as e:
-        console.print(f"[red]✗ Failed to delete node: {e}[/red]")
-        sys.exit(1)
-
-    console.print("Waiting for CDC propagation...")
-
-    def check_delete():
-        try:
-            result = target.execute_read("MATCH (p:Person {id: 9999}) RETURN p")
-            return len(result) == 0
-        except Exception:
-            return False
+    # Cleanup
+    source.execute_write(DELETE_TEST_NODES_QUERY, {"ids": TEST_IDS})
 
-    success, elapsed = wait_for_condition(check_delete)
-    if success:
-        console.print(f"[bold green]✓ DELETE event propagated in {elapsed:.1f}s[/bold green]")
-        console.print(f"  Node no longer exists in target")
-    else:
-        console.print(f"[bold red]✗ DELETE event failed - node still exists after {elapsed:.1f}s[/bold red]")
+    if not all(results):
         sys.exit(1)
 
-    console.print()
     console.print("[bold green]" + "="*60 + "[/bold green]")
     console.print("[bold green]✓ All CDC event types working correctly![/bold green]")
     console.print("[bold green]" + "="*60 + "[/bold green]")
 
-    # Cleanup
     source.close()
     target.close()
 
@@ -1,15 +1,21 @@
 """CDC utility functions for verifying readiness and health."""
 
+import queue
+import threading
 import time
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from .neo4j_client import Neo4jClient
 
+PROCEDURE_NOT_FOUND = "Neo.ClientError.Procedure.ProcedureNotFound"
+
 
 def wait_for_cdc_ready(client: Neo4jClient, timeout_seconds: int = 60) -> bool:
     """
     Wait for CDC to be fully initialized and ready to capture changes.
 
     This calls db.cdc.current() to verify the CDC transaction log is active.
+    The call is only repeated while it fails with a "not ready" error, backing
+    off from 0.2s to 2s between attempts.
 
     Args:
         client: Neo4jClient instance connected to CDC-enabled database
@@ -20,10 +26,16 @@ def wait_for_cdc_ready(client: Neo4jClient, timeout_seconds: int = 60) -> bool:
     """
     print(f"⏳ Waiting for CDC to initialize (timeout: {timeout_seconds}s)...")
 
-    for i in range(timeout_seconds):
+    start = time.time()
+    delay = 0.2
+    last_report = start
+    last_error: Optional[Exception] = None
+
+    while True:
         try:
-            # Call db.cdc.current() to verify CDC is ready
-            result = client.execute_read("CALL db.cdc.current()")
+            # Call db.cdc.current() to verify CDC is ready. Auto-commit skips the
+            # driver's managed retries, which could overrun the deadline by up to 30s
+            result = client.execute_auto_commit("CALL db.cdc.current()")
 
             if result and len(result) > 0:
                 change_id = result[0].get('id', 'unknown')
@@ -34,61 +46,73 @@ def wait_for_cdc_ready(client: Neo4jClient, timeout_seconds: int = 60) -> bool:
             error_msg = str(e).lower()
 
             # Check for known "not ready" errors
-            if any(x in error_msg for x in ['procedure', 'not found', 'no procedure', 'cdc']):
-                if i == timeout_seconds - 1:
-                    raise Exception(f"CDC not ready after {timeout_seconds} seconds: {e}")
-
-                if i % 10 == 0:  # Print every 10 seconds
-                    print(f"  Waiting... ({i+1}/{timeout_seconds}s)")
-
-                time.sleep(1)
-            else:
+            if getattr(e, "code", None) != PROCEDURE_NOT_FOUND and not any(
+                x in error_msg for x in ['procedure', 'not found', 'no procedure', 'cdc']
+            ):
                 # Different error - raise immediately
                 raise Exception(f"Unexpected error checking CDC: {e}")
+            last_error = e
+
+        elapsed = time.time() - start
+        if elapsed >= timeout_seconds:
+            if last_error is not None:
+                raise Exception(f"CDC not ready after {timeout_seconds} seconds: {last_error}")
+            raise Exception(f"CDC readiness check timed out after {timeout_seconds} seconds")
 
-    raise Exception(f"CDC readiness check timed out after {timeout_seconds} seconds")
+        if time.time() - last_report >= 10:  # Print every 10 seconds
+            print(f"  Waiting... ({int(elapsed)}/{timeout_seconds}s)")
+            last_report = time.time()
 
+        time.sleep(min(delay, timeout_seconds - elapsed))
+        delay = min(delay * 2, 2.0)
 
-def verify_cdc_capturing(client: Neo4jClient) -> bool:
+
+def verify_cdc_capturing(client: Neo4jClient, timeout_seconds: float = 10) -> bool:
     """
     Verify CDC is actively capturing changes by writing a test node.
 
     Args:
         client: Neo4jClient instance connected to CDC-enabled database
+        timeout_seconds: Maximum seconds to wait for the events (default 10)
 
     Returns:
         True if CDC captured the test change
     """
     print("🔬 Verifying CDC is actively capturing changes...")
 
-    # Get current change ID
-    result = client.execute_read("CALL db.cdc.current()")
-    from_id = result[0]['id']
-
-    # Write a test node
+    # Write a test node, reading the change ID in the same transaction
     test_id = f"cdc-test-{int(time.time())}"
-    client.execute_write(
-        "CREATE (t:_CDCTest {id: $id, timestamp: timestamp()})",
-        {"id": test_id}
-    )
-
-    # Delete it
+    result = client.execute_write_returning("""
+        CALL db.cdc.current() YIELD id AS fromId
+        CREATE (t:_CDCTest {id: $id, timestamp: timestamp()})
+        RETURN fromId
+    """, {"id": test_id})
+    from_id = result[0]['fromId']
+
+    # Delete it (a separate transaction: a node created and deleted in one
+    # transaction leaves no change in the CDC log)
     client.execute_write(
         "MATCH (t:_CDCTest {id: $id}) DELETE t",
         {"id": test_id}
     )
 
-    # Query CDC log to see if changes were captured
-    time.sleep(2)  # Small delay for CDC to process
-
-    result = client.execute_read("""
-        CALL db.cdc.query($fromId, null)
-        YIELD event
-        WHERE event.metadata.executingUser IS NOT NULL
-        RETURN count(*) as changes
-    """, {"fromId": from_id})
-
-    changes = result[0]['changes']
+    # Poll the CDC log until both changes are visible
+    start = time.time()
+    delay = 0.05
+    while True:
+        result = client.execute_read("""
+            CALL db.cdc.query($fromId, null)
+            YIELD event
+            WHERE event.metadata.executingUser IS NOT NULL
+            RETURN count(*) as changes
+        """, {"fromId": from_id})
+
+        changes = result[0]['changes']
+        elapsed = time.time() - start
+        if changes >= 2 or elapsed >= timeout_seconds:
+            break
+        time.sleep(min(delay, timeout_seconds - elapsed))
+        delay = min(delay * 1.5, 1.0)
 
     if changes >= 2:  # Should see CREATE + DELETE
         print(f"✓ CDC is actively capturing changes ({changes} events captured)")
@@ -96,3 +120,104 @@ def verify_cdc_capturing(client: Neo4jClient) -> bool:
     else:
         print(f"✗ CDC not capturing changes (expected 2+ events, got {changes})")
         return False
+
+
+def get_cdc_cursor(client: Neo4jClient) -> str:
+    """
+    Get the current CDC change ID, to query changes made after this point.
+
+    Args:
+        client: Neo4jClient instance connected to CDC-enabled database
+
+    Returns:
+        Change ID from db.cdc.current()
+    """
+    return client.execute_read("CALL db.cdc.current()")[0]["id"]
+
+
+class CdcWatcher(threading.Thread):
+    """
+    Background thread that follows the CDC log until a matching event appears.
+
+    Reads db.cdc.query() from a cursor, advancing it past events already seen,
+    and puts the first (change_id, event) that satisfies the predicate on the
+    events queue. Stops after that match or after timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        client: Neo4jClient,
+        from_id: str,
+        predicate: Callable[[Dict[str, Any]], bool],
+        timeout_seconds: float = 10,
+        poll_interval: float = 0.1,
+    ):
+        """
+        Args:
+            client: Neo4jClient instance connected to CDC-enabled database
+            from_id: Change ID to start reading from (see get_cdc_cursor)
+            predicate: Called with each event map; True marks the event being waited for
+            timeout_seconds: Maximum seconds to follow the log (default 10)
+            poll_interval: Seconds to wait after a query that returned no new events
+        """
+        super().__init__(daemon=True)
+        self.client = client
+        self.cursor = from_id
+        self.predicate = predicate
+        self.timeout_seconds = timeout_seconds
+        self.poll_interval = poll_interval
+        self.events: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self.error: Optional[str] = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        deadline = time.time() + self.timeout_seconds
+        while not self._stop_event.is_set() and time.time() < deadline:
+            result = self.client.poll_read("""
+                CALL db.cdc.query($fromId, null)
+                YIELD id, event
+                RETURN id, event
+            """, {"fromId": self.cursor})
+            if result is None:
+                self.error = "db.cdc.query() failed or timed out"
+                result = []
+            else:
+                self.error = None
+
+            for record in result:
+                self.cursor = record["id"]
+                if self.predicate(record["event"]):
+                    self.events.put((record["id"], record["event"]))
+                    return
+
+            # Only wait when there was nothing new to read
+            if not result:
+                self._stop_event.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        """Stop following the log and wait for any in-flight poll to finish."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+
+def is_node_event(event: Dict[str, Any], operation: str, node_id: Any) -> bool:
+    """
+    Check whether a CDC event is a given operation on the node with the given id property.
+
+    Args:
+        event: Event map from db.cdc.query()
+        operation: CDC operation code: "c" (create), "u" (update) or "d" (delete)
+        node_id: Value of the node's id property
+
+    Returns:
+        True if the event matches
+    """
+    if event.get("eventType") != "n" or event.get("operation") != operation:
+        return False
+    state = event.get("state") or {}
+    for side in ("before", "after"):
+        properties = (state.get(side) or {}).get("properties") or {}
+        if properties.get("id") == node_id:
+            return True
+    return False
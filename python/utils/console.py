@@ -0,0 +1,68 @@
+"""Console output that only loads Rich when writing to an interactive terminal."""
+
+import re
+import sys
+from typing import Any, Dict, List, Sequence
+
+# Rich markup tags such as [bold red], [/bold red], [#ff8800], [link=...] and [/].
+# Only lowercase style words match, so bracketed text in messages such as
+# [Errno 111] or [SSL: CERTIFICATE_VERIFY_FAILED] is printed as is.
+_STYLE_WORD = r"(?:[a-z][a-z0-9_]*|#[0-9a-fA-F]{6}|link=[^\[\]\s]+)"
+MARKUP_TAG = re.compile(rf"\[/?{_STYLE_WORD}(?: {_STYLE_WORD})*\]|\[/\]")
+
+
+class PlainConsole:
+    """Stand-in for rich.console.Console that prints text with markup stripped."""
+
+    def print(self, *objects: Any, sep: str = " ", end: str = "\n", **kwargs: Any) -> None:
+        """Print objects like Console.print, ignoring Rich-only keyword arguments."""
+        text = sep.join(str(obj) for obj in objects)
+        print(MARKUP_TAG.sub("", text), end=end)
+
+
+def make_console():
+    """
+    Create the console for script output.
+
+    Returns:
+        A Rich Console when stdout is a TTY, otherwise a PlainConsole, so CI and
+        piped runs skip Rich's import and markup rendering entirely
+    """
+    if sys.stdout.isatty():
+        from rich.console import Console
+        return Console()
+    return PlainConsole()
+
+
+def print_table(
+    console: Any,
+    title: str,
+    columns: Sequence[Dict[str, Any]],
+    rows: List[Sequence[str]],
+) -> None:
+    """
+    Print a table with Rich on a TTY, or as aligned plain text otherwise.
+
+    Args:
+        console: Console returned by make_console()
+        title: Table title
+        columns: Keyword arguments for Table.add_column (must include "header")
+        rows: Cell values, one sequence per row
+    """
+    if isinstance(console, PlainConsole):
+        headers = [column["header"] for column in columns]
+        widths = [max(len(str(cell)) for cell in col) for col in zip(headers, *rows)]
+        console.print(title)
+        for row in [headers, *rows]:
+            cells = (str(cell).ljust(width) for cell, width in zip(row, widths))
+            console.print("  ".join(cells).rstrip())
+        return
+
+    from rich.table import Table
+
+    table = Table(title=title)
+    for column in columns:
+        table.add_column(**column)
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
@@ -1,13 +1,95 @@
 """Neo4j client utility for database operations."""
 
-from typing import Dict, Any, List, Optional
-import logging
-from neo4j import GraphDatabase, Driver
-from neo4j.exceptions import Neo4jError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import os
+import threading
+from neo4j import GraphDatabase, Driver, NotificationMinimumSeverity, Query, Session
+from neo4j.exceptions import DriverError, Neo4jError
 
-# Suppress Neo4j driver notification warnings about non-existent labels/properties
-# (expected when polling a subscriber database that hasn't received data yet)
-logging.getLogger("neo4j.notifications").setLevel(logging.ERROR)
+
+def driver_settings() -> Dict[str, Any]:
+    """
+    Connection pool settings for GraphDatabase.driver.
+
+    Each value can be overridden with an environment variable. Pooled Bolt
+    connections are retired after 180s, before load balancers or NAT on the
+    path to Aura drop them for being idle.
+
+    heartbeat/heartbeat.py has its own copy; keep the two in sync.
+
+    Returns:
+        Keyword arguments for GraphDatabase.driver
+    """
+    return {
+        "max_connection_pool_size": int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "50")),
+        "connection_acquisition_timeout": float(
+            os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30")
+        ),
+        "max_connection_lifetime": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "180")),
+        "keep_alive": True,
+    }
+
+
+# Drivers shared by every Neo4jClient for the same URI and credentials, with a
+# count of the clients using each one. A driver is closed when its last client is.
+_DriverKey = Tuple[str, str, str]
+_drivers: Dict[_DriverKey, Driver] = {}
+_driver_refs: Dict[_DriverKey, int] = {}
+_drivers_lock = threading.Lock()
+
+
+def _acquire_driver(key: _DriverKey) -> Driver:
+    """Return the shared driver for key, creating it on first use."""
+    with _drivers_lock:
+        if key not in _drivers:
+            uri, username, password = key
+            # Notifications are turned off at the server rather than filtered from the
+            # log: polling a subscriber that hasn't received data yet would otherwise
+            # raise warnings about non-existent labels/properties on every query
+            _drivers[key] = GraphDatabase.driver(
+                uri,
+                auth=(username, password),
+                notifications_min_severity=NotificationMinimumSeverity.OFF,
+                **driver_settings(),
+            )
+            _driver_refs[key] = 0
+        _driver_refs[key] += 1
+        return _drivers[key]
+
+
+def _release_driver(key: _DriverKey) -> None:
+    """Drop one reference to a shared driver, closing it when none remain."""
+    with _drivers_lock:
+        _driver_refs[key] -= 1
+        if _driver_refs[key] > 0:
+            return
+        del _driver_refs[key]
+        driver = _drivers.pop(key)
+    driver.close()
+
+
+def _label_counts_subquery(labels: List[str]) -> str:
+    """
+    Build a CALL subquery returning label and count rows for the given labels.
+
+    Each branch matches a single literal label, which Neo4j answers from its
+    count store instead of scanning every node. Label names are passed back
+    as $labels parameters and only appear in the pattern, backtick-escaped.
+
+    Args:
+        labels: Label names, as returned by db.labels()
+
+    Returns:
+        Cypher CALL subquery text, to be run with {"labels": labels}
+    """
+    branches = [
+        f"MATCH (n:`{label.replace('`', '``')}`) "
+        f"RETURN $labels[{i}] AS label, count(n) AS count"
+        for i, label in enumerate(labels)
+    ]
+    return "CALL () { " + " UNION ALL ".join(branches) + " }"
 
 
 class Neo4jClient:
@@ -24,12 +106,72 @@ class Neo4jClient:
         """
         self.uri = uri
         self.username = username
-        self.driver: Driver = GraphDatabase.driver(uri, auth=(username, password))
+        # Clients for the same database share one driver (and its TLS connections
+        # and routing table) instead of each building their own
+        self._driver_key: _DriverKey = (uri, username, password)
+        self.driver: Driver = _acquire_driver(self._driver_key)
+        self._closed = False
+        # One reusable session per thread (sessions are not thread-safe), keyed by
+        # thread id and kept with its thread so sessions of finished threads can be closed
+        self._sessions: Dict[int, Tuple[threading.Thread, Session]] = {}
+        self._sessions_lock = threading.Lock()
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """
+        Yield the calling thread's cached session, creating it on first use.
+
+        A session that raises is closed and dropped so the next call starts clean.
+        """
+        thread = threading.current_thread()
+        with self._sessions_lock:
+            entry = self._sessions.get(thread.ident)
+            if entry is None or entry[0] is not thread:
+                for ident, (owner, stale) in list(self._sessions.items()):
+                    if not owner.is_alive():
+                        stale.close()
+                        del self._sessions[ident]
+                entry = (thread, self.driver.session())
+                self._sessions[thread.ident] = entry
+        session = entry[1]
+        try:
+            yield session
+        except Exception:
+            with self._sessions_lock:
+                self._sessions.pop(thread.ident, None)
+            session.close()
+            raise
 
     def execute_write(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute a write query (CREATE, MERGE, UPDATE, DELETE).
 
+        Only the result summary is fetched, so no records are streamed back.
+        Use execute_write_returning when the query's records are needed.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+
+        Returns:
+            Empty list
+        """
+        try:
+            with self._session() as session:
+                session.execute_write(
+                    lambda tx: tx.run(query, parameters or {}).consume()
+                )
+                return []
+        except Neo4jError as e:
+            print(f"Error executing write query: {e}")
+            raise
+
+    def execute_write_returning(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a write query and return its records.
+
         Args:
             query: Cypher query string
             parameters: Query parameters
@@ -38,15 +180,60 @@ class Neo4jClient:
             List of result records as dictionaries
         """
         try:
-            with self.driver.session() as session:
-                result = session.execute_write(
+            with self._session() as session:
+                return session.execute_write(
                     lambda tx: tx.run(query, parameters or {}).data()
                 )
-                return result
         except Neo4jError as e:
             print(f"Error executing write query: {e}")
             raise
 
+    def execute_write_batch(
+        self, statements: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several write queries in one transaction with a single commit.
+
+        Args:
+            statements: (query, parameters) pairs, run in order
+
+        Returns:
+            List of result records as dictionaries, one list per statement
+        """
+        def run_all(tx):
+            return [tx.run(query, parameters or {}).data() for query, parameters in statements]
+
+        try:
+            with self._session() as session:
+                return session.execute_write(run_all)
+        except Neo4jError as e:
+            print(f"Error executing write batch: {e}")
+            raise
+
+    def execute_auto_commit(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a query in an auto-commit (implicit) transaction.
+
+        Required for queries that manage their own transactions, such as
+        CALL { ... } IN [CONCURRENT] TRANSACTIONS, which cannot run inside
+        a managed transaction function.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+
+        Returns:
+            List of result records as dictionaries
+        """
+        try:
+            with self._session() as session:
+                return session.run(query, parameters or {}).data()
+        except Neo4jError as e:
+            print(f"Error executing auto-commit query: {e}")
+            raise
+
     def execute_read(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Execute a read query (MATCH, RETURN).
@@ -59,7 +246,7 @@ class Neo4jClient:
             List of result records as dictionaries
         """
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 result = session.execute_read(
                     lambda tx: tx.run(query, parameters or {}).data()
                 )
@@ -68,6 +255,56 @@ class Neo4jClient:
             print(f"Error executing read query: {e}")
             raise
 
+    def fetch_scalar(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Execute a read query and return the first column of its single record.
+
+        Skips building a dictionary per record, which is all execute_read
+        callers need for counts and boolean probes.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+
+        Returns:
+            The value, or None if the query returned no records
+        """
+        def first_value(tx):
+            record = tx.run(query, parameters or {}).single()
+            return None if record is None else record.value(0)
+
+        try:
+            with self._session() as session:
+                return session.execute_read(first_value)
+        except Neo4jError as e:
+            print(f"Error executing read query: {e}")
+            raise
+
+    def poll_read(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None, timeout: float = 2.0
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run an idempotent read once, for use inside a polling loop.
+
+        Unlike execute_read, this does not go through the driver's managed
+        transaction retries, which can back off for up to 30 seconds on a
+        transient error. The server-side timeout bounds each poll and the
+        caller's loop does the retrying.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+            timeout: Server-side transaction timeout in seconds
+
+        Returns:
+            List of result records as dictionaries, or None if the query failed
+        """
+        try:
+            with self._session() as session:
+                return session.run(Query(query, timeout=timeout), parameters or {}).data()
+        except (Neo4jError, DriverError):
+            return None
+
     def test_connection(self) -> bool:
         """
         Test if the database connection is working.
@@ -76,10 +313,10 @@ class Neo4jClient:
             True if connection is successful, False otherwise
         """
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 result = session.run("RETURN 1 AS num")
                 return result.single()["num"] == 1
-        except Neo4jError as e:
+        except (Neo4jError, DriverError) as e:
             print(f"Connection test failed: {e}")
             return False
 
@@ -90,8 +327,7 @@ class Neo4jClient:
         Returns:
             Node count
         """
-        result = self.execute_read("MATCH (n) RETURN count(n) AS count")
-        return result[0]["count"] if result else 0
+        return self.fetch_scalar("MATCH (n) RETURN count(n) AS count") or 0
 
     def get_relationship_count(self) -> int:
         """
@@ -100,34 +336,81 @@ class Neo4jClient:
         Returns:
             Relationship count
         """
-        result = self.execute_read("MATCH ()-[r]->() RETURN count(r) AS count")
-        return result[0]["count"] if result else 0
+        return self.fetch_scalar("MATCH ()-[r]->() RETURN count(r) AS count") or 0
 
-    def get_label_counts(self) -> Dict[str, int]:
+    def get_counts(self) -> Dict[str, Any]:
         """
-        Get count of nodes for each label.
+        Get node and relationship totals and the labels in use in a single round trip.
+
+        The labels can be passed to get_label_counts, so comparing totals and
+        then per-label counts takes two round trips instead of three.
 
         Returns:
-            Dictionary mapping label names to counts
+            Dictionary with "nodes" and "relationships" counts and a "labels" list
         """
         result = self.execute_read("""
-            MATCH (n)
-            UNWIND labels(n) AS label
-            RETURN label, count(*) AS count
-            ORDER BY count DESC
+            CALL () { MATCH (n) RETURN count(n) AS nodes }
+            CALL () { MATCH ()-[r]->() RETURN count(r) AS relationships }
+            CALL () { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+            RETURN nodes, relationships, labels
         """)
-        return {record["label"]: record["count"] for record in result}
+        return result[0] if result else {"nodes": 0, "relationships": 0, "labels": []}
+
+    def get_labels(self) -> List[str]:
+        """
+        Get the labels in use in the database.
+
+        Returns:
+            List of label names
+        """
+        result = self.execute_read("CALL db.labels() YIELD label RETURN label")
+        return [record["label"] for record in result]
+
+    def get_label_counts(self, labels: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Get count of nodes for each label.
+
+        Args:
+            labels: Labels to count, e.g. from get_counts; looked up when omitted
+
+        Returns:
+            Dictionary mapping label names to counts
+        """
+        if labels is None:
+            labels = self.get_labels()
+        if not labels:
+            return {}
+        result = self.execute_read(
+            _label_counts_subquery(labels) + " RETURN label, count ORDER BY count DESC",
+            {"labels": labels},
+        )
+        return {record["label"]: record["count"] for record in result if record["count"]}
 
     def clear_database(self) -> None:
         """
         Clear all nodes and relationships from the database.
         Use with caution!
+
+        Deletes in batches so large graphs never build one huge transaction.
         """
-        self.execute_write("MATCH (n) DETACH DELETE n")
+        self.execute_auto_commit("""
+            MATCH (n)
+            CALL (n) {
+                DETACH DELETE n
+            } IN TRANSACTIONS OF 10000 ROWS
+        """)
 
     def close(self) -> None:
-        """Close the database connection."""
-        self.driver.close()
+        """Release the database connection; the shared driver closes with its last client."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._sessions_lock:
+            sessions = [session for _, session in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        _release_driver(self._driver_key)
 
     def __enter__(self):
         """Context manager entry."""
@@ -136,3 +419,20 @@ class Neo4jClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+
+def check_connections(*clients: Neo4jClient) -> bool:
+    """
+    Test several clients' connections concurrently.
+
+    Also warms each driver's connection pool (TLS handshake, routing table),
+    so the handshakes overlap instead of landing on the first real query.
+
+    Args:
+        clients: Clients to test
+
+    Returns:
+        True if every connection succeeded
+    """
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        return all(executor.map(Neo4jClient.test_connection, clients))
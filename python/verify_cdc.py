@@ -10,53 +10,135 @@ Usage:
     export SUBSCRIBER_NEO4J_URI=$(terraform output -raw subscriber_neo4j_uri)
     export SUBSCRIBER_NEO4J_PASSWORD=$(terraform output -raw subscriber_neo4j_password)
     cd ../python
-    python verify_cdc.py
+    python verify_cdc.py          # label counts only compared once totals match
+    python verify_cdc.py --full   # always compare label counts
 """
 
+import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Tuple
 
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 from utils.neo4j_client import Neo4jClient
 
 
 console = Console()
 
-
-def compare_databases(source: Neo4jClient, target: Neo4jClient) -> bool:
+# Status cells are parsed from markup once and shared by every row
+MATCH_CELL = Text.from_markup("[green]✓ Match[/green]")
+MISMATCH_CELL = Text.from_markup("[red]✗ Mismatch[/red]")
+CDC_TRACKING_CELL = Text.from_markup("[green]✓ CDC Tracking[/green]")
+
+# Printed as one block when the graphs differ
+SYNC_ISSUE_HINTS = """\
+[bold yellow]Possible causes:[/bold yellow]
+  1. Bulk load still propagating — wait 1-2 minutes, then run verify_cdc.py again
+  2. Connector not running (check connector status below)
+  3. Heartbeat sidecar not running — if it stopped, Event Hubs connections may have gone idle
+  4. Topic has multiple partitions — relationships may arrive before nodes
+     The cdc-all topic must have exactly 1 partition. If it has more, delete it in
+     Azure Event Hubs and re-apply terraform so it is recreated with 1 partition.
+
+[bold yellow]Troubleshooting:[/bold yellow]
+  cd terraform
+  KAFKA_CONNECT=$(terraform output -raw kafka_connect_rest_api)
+  curl -s $KAFKA_CONNECT/connectors/neo4j-master-publisher/status | jq .
+  curl -s $KAFKA_CONNECT/connectors/neo4j-subscriber-consumer/status | jq ."""
+
+
+def fetch_both(source_query: Callable[[], Any], target_query: Callable[[], Any]) -> Tuple[Any, Any]:
+    """Run a source and a target query concurrently; each worker thread gets its own session."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_future = executor.submit(source_query)
+        target_future = executor.submit(target_query)
+        return source_future.result(), target_future.result()
+
+
+def compare_databases(source: Neo4jClient, target: Neo4jClient, full: bool = False) -> bool:
     """
     Compare source and subscriber graphs for CDC verification.
 
+    Label counts are only compared once the totals match, unless full is set:
+    while a load is still propagating they would mismatch anyway.
+
     Args:
         source: Master graph client
         target: Subscriber graph client
+        full: Compare label counts even when the totals differ
 
     Returns:
         True if databases match, False otherwise
     """
     console.print("[bold blue]Comparing source and subscriber graphs...[/bold blue]\n")
 
-    all_match = True
+    source_counts, target_counts = fetch_both(source.get_counts, target.get_counts)
 
     # Compare node counts
-    source_nodes = source.get_node_count()
-    target_nodes = target.get_node_count()
+    source_nodes = source_counts["nodes"]
+    target_nodes = target_counts["nodes"]
     nodes_match = source_nodes == target_nodes
 
     # Compare relationship counts
-    source_rels = source.get_relationship_count()
-    target_rels = target.get_relationship_count()
+    source_rels = source_counts["relationships"]
+    target_rels = target_counts["relationships"]
     rels_match = source_rels == target_rels
 
     # Compare label counts
-    source_labels = source.get_label_counts()
-    target_labels = target.get_label_counts()
-    labels_match = source_labels == target_labels
+    labels_compared = nodes_match and rels_match or full
+    if labels_compared:
+        # Reuse the labels fetched with the totals rather than querying db.labels() again
+        source_labels, target_labels = fetch_both(
+            lambda: source.get_label_counts(source_counts["labels"]),
+            lambda: target.get_label_counts(target_counts["labels"]),
+        )
+    else:
+        source_labels, target_labels = {}, {}
+
+    # Summary rows, a separator, then label counts (SourceEvent is expected
+    # only in the target, so it is not compared)
+    rows = [
+        (
+            "Total Nodes",
+            str(source_nodes),
+            str(target_nodes),
+            MATCH_CELL if nodes_match else MISMATCH_CELL,
+        ),
+        (
+            "Total Relationships",
+            str(source_rels),
+            str(target_rels),
+            MATCH_CELL if rels_match else MISMATCH_CELL,
+        ),
+    ]
+    if labels_compared:
+        rows.append(("", "", "", ""))
+    all_labels = sorted(source_labels.keys() | target_labels.keys())
+    mismatched = {
+        label for label in all_labels
+        if label != "SourceEvent" and source_labels.get(label, 0) != target_labels.get(label, 0)
+    }
+    all_match = not mismatched
+    source_event_count = target_labels.get("SourceEvent", 0)
+
+    for label in all_labels:
+        if label == "SourceEvent":
+            status = CDC_TRACKING_CELL
+        else:
+            status = MISMATCH_CELL if label in mismatched else MATCH_CELL
+        rows.append((
+            f"{label} Nodes",
+            str(source_labels.get(label, 0)),
+            str(target_labels.get(label, 0)),
+            status,
+        ))
 
     # Create comparison table
     table = Table(title="CDC Verification Results", show_header=True, header_style="bold magenta")
@@ -64,56 +146,15 @@ def compare_databases(source: Neo4jClient, target: Neo4jClient) -> bool:
     table.add_column("Source", style="yellow", justify="right")
     table.add_column("Target", style="yellow", justify="right")
     table.add_column("Status", style="green", width=15)
-
-    # Add summary rows
-    table.add_row(
-        "Total Nodes",
-        str(source_nodes),
-        str(target_nodes),
-        "[green]✓ Match[/green]" if nodes_match else "[red]✗ Mismatch[/red]"
-    )
-    table.add_row(
-        "Total Relationships",
-        str(source_rels),
-        str(target_rels),
-        "[green]✓ Match[/green]" if rels_match else "[red]✗ Mismatch[/red]"
-    )
-
-    # Add separator
-    table.add_row("", "", "", "")
-
-    # Add label counts (excluding SourceEvent which is expected only in target)
-    all_labels = set(source_labels.keys()) | set(target_labels.keys())
-    source_event_count = 0
-
-    for label in sorted(all_labels):
-        source_count = source_labels.get(label, 0)
-        target_count = target_labels.get(label, 0)
-
-        # SourceEvent is expected only in target (added by sink connector)
-        if label == "SourceEvent":
-            source_event_count = target_count
-            table.add_row(
-                f"{label} Nodes",
-                str(source_count),
-                str(target_count),
-                "[green]✓ CDC Tracking[/green]"
-            )
-            continue
-
-        match = source_count == target_count
-
-        table.add_row(
-            f"{label} Nodes",
-            str(source_count),
-            str(target_count),
-            "[green]✓ Match[/green]" if match else "[red]✗ Mismatch[/red]"
-        )
-
-        if not match:
-            all_match = False
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
+    if not labels_compared:
+        console.print(
+            "[dim]Label counts skipped while totals differ "
+            "(run with --full to compare them)[/dim]"
+        )
     console.print()
 
     # Overall status
@@ -123,29 +164,31 @@ def compare_databases(source: Neo4jClient, target: Neo4jClient) -> bool:
         console.print("[bold green]Source and subscriber graphs are in perfect sync.[/bold green]")
 
         if source_event_count > 0:
-            console.print(f"\n[bold cyan]ℹ Info:[/bold cyan] {source_event_count} nodes have SourceEvent label in subscriber")
-            console.print("[dim]This is expected - the sink connector adds this label to track CDC-replicated nodes[/dim]")
+            console.print(
+                f"\n[bold cyan]ℹ Info:[/bold cyan] {source_event_count} nodes "
+                "have SourceEvent label in subscriber"
+            )
+            console.print(
+                "[dim]This is expected - the sink connector adds this label "
+                "to track CDC-replicated nodes[/dim]"
+            )
 
         return True
     else:
         console.print("[bold red]✗ CDC sync issue detected![/bold red]")
-        console.print("[bold yellow]Possible causes:[/bold yellow]")
-        console.print("  1. Bulk load still propagating — wait 1-2 minutes, then run verify_cdc.py again")
-        console.print("  2. Connector not running (check connector status below)")
-        console.print("  3. Heartbeat sidecar not running — if it stopped, Event Hubs connections may have gone idle")
-        console.print("  4. Topic has multiple partitions — relationships may arrive before nodes")
-        console.print("     The cdc-all topic must have exactly 1 partition. If it has more, delete it in")
-        console.print("     Azure Event Hubs and re-apply terraform so it is recreated with 1 partition.")
-        console.print("\n[bold yellow]Troubleshooting:[/bold yellow]")
-        console.print("  cd terraform")
-        console.print("  KAFKA_CONNECT=$(terraform output -raw kafka_connect_rest_api)")
-        console.print("  curl -s $KAFKA_CONNECT/connectors/neo4j-master-publisher/status | jq .")
-        console.print("  curl -s $KAFKA_CONNECT/connectors/neo4j-subscriber-consumer/status | jq .")
+        console.print(SYNC_ISSUE_HINTS)
         return False
 
 
 def main():
     """Main verification function."""
+    parser = argparse.ArgumentParser(description="Compare source and subscriber Neo4j databases.")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="compare label counts even when node or relationship totals differ",
+    )
+    args = parser.parse_args()
+
     # Get database credentials from environment variables
     source_uri = os.getenv("MASTER_NEO4J_URI")
     source_username = os.getenv("MASTER_NEO4J_USERNAME", "neo4j")
@@ -174,19 +217,19 @@ def main():
         with Neo4jClient(source_uri, source_username, source_password) as source, \
              Neo4jClient(target_uri, target_username, target_password) as target:
 
-            # Test connections
-            if not source.test_connection():
-                console.print("[bold red]Failed to connect to master graph![/bold red]")
-                sys.exit(1)
-
-            if not target.test_connection():
-                console.print("[bold red]Failed to connect to subscriber graph![/bold red]")
+            # Test both connections at once; this also warms each driver's
+            # pool before the comparison queries fan out
+            source_ok, target_ok = fetch_both(source.test_connection, target.test_connection)
+            for ok, name in ((source_ok, "master"), (target_ok, "subscriber")):
+                if not ok:
+                    console.print(f"[bold red]Failed to connect to {name} graph![/bold red]")
+            if not (source_ok and target_ok):
                 sys.exit(1)
 
             console.print("[green]Connected to both databases successfully[/green]\n")
 
             # Compare databases
-            success = compare_databases(source, target)
+            success = compare_databases(source, target, full=args.full)
 
             # Exit with appropriate code
             sys.exit(0 if success else 1)
@@ -7,11 +7,30 @@ Uses PUT for idempotent connector creation/updates.
 Verifies connectors reach RUNNING state before exiting.
 """
 
+import json
 import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection pool for every Kafka Connect request, so the
+# polling loops don't open a new TCP connection per call
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=4))
+SESSION.mount("https://", HTTPAdapter(pool_maxsize=4))
+SESSION.headers["Content-Type"] = "application/json"
+
+
+def backoff_delay(attempt: int, initial: float = 0.5, cap: float = 5.0) -> float:
+    """Seconds to wait before poll number attempt + 1.
+
+    Doubles from initial up to cap, plus up to 250ms of jitter.
+    """
+    return min(cap, initial * 2 ** attempt) + random.uniform(0, 0.25)
 
 
 def wait_for_connect(url: str, timeout: int = 240) -> None:
@@ -30,9 +49,10 @@ def wait_for_connect(url: str, timeout: int = 240) -> None:
     print(f"Waiting for Kafka Connect at {url}...")
     start = time.time()
     connection_errors = 0
+    attempt = 0
     while time.time() - start < timeout:
         try:
-            resp = requests.get(f"{url}/connectors", timeout=10)
+            resp = SESSION.get(f"{url}/connectors", timeout=10)
             if resp.status_code == 200:
                 print("Kafka Connect is ready!")
                 return
@@ -46,36 +66,81 @@ def wait_for_connect(url: str, timeout: int = 240) -> None:
                 connection_errors = 0
         except requests.RequestException:
             pass
-        print(f"  Not ready yet, retrying in 5s... ({int(time.time() - start)}s elapsed)")
-        time.sleep(5)
+        delay = backoff_delay(attempt)
+        attempt += 1
+        print(f"  Not ready yet, retrying in {delay:.1f}s... ({int(time.time() - start)}s elapsed)")
+        time.sleep(delay)
     raise TimeoutError(f"Kafka Connect not ready after {timeout}s")
 
 
 def connector_exists(url: str, name: str) -> bool:
     """Check if a connector exists (may have been created despite timeout)."""
     try:
-        resp = requests.get(f"{url}/connectors/{name}/status", timeout=10)
+        resp = SESSION.get(f"{url}/connectors/{name}/status", timeout=10)
         return resp.status_code == 200
     except requests.RequestException:
         return False
 
 
+def normalize_config(config: dict) -> dict:
+    """Normalize a connector config for comparison.
+
+    Kafka Connect stores every value as a string and adds the connector's
+    name to the config it returns.
+    """
+    return {key: str(value) for key, value in config.items() if key != "name"}
+
+
+def connector_up_to_date(url: str, name: str, config: dict) -> bool:
+    """Check if a connector is deployed with this config and all of it is RUNNING.
+
+    Reads config and status together with GET /connectors?expand=info&expand=status.
+    A connector that is FAILED, paused or has no tasks is not up to date, so
+    re-running the script still redeploys it.
+    """
+    try:
+        resp = SESSION.get(
+            f"{url}/connectors",
+            params=[("expand", "info"), ("expand", "status")],
+            timeout=10,
+        )
+        if resp.status_code != 200:
+            return False
+        connector = resp.json().get(name, {})
+        deployed_config = connector.get("info", {}).get("config", {})
+        status = connector.get("status", {})
+        tasks = status.get("tasks", [])
+        return (
+            normalize_config(deployed_config) == normalize_config(config)
+            and status.get("connector", {}).get("state") == "RUNNING"
+            and bool(tasks)
+            and all(task.get("state") == "RUNNING" for task in tasks)
+        )
+    except (requests.RequestException, ValueError):
+        return False
+
+
 def deploy_connector(url: str, name: str, config: dict, retries: int = 3) -> None:
     """Deploy or update a connector using PUT (idempotent).
 
     Uses a 120s timeout to accommodate Event Hubs cold starts where topic
     creation + SASL negotiation + Neo4j driver init can take 60-90s.
     Retries on timeout, checking if connector was created despite timeout.
+    Skips the PUT when the connector already has this exact config and is
+    RUNNING.
     """
     print(f"Deploying connector: {name}")
+    if connector_up_to_date(url, name, config):
+        print(f"  Connector {name} config unchanged and RUNNING, skipping deploy")
+        return
     last_error = None
+    payload = json.dumps(config).encode()
 
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.put(
+            resp = SESSION.put(
                 f"{url}/connectors/{name}/config",
-                json=config,
-                headers={"Content-Type": "application/json"},
+                data=payload,
                 timeout=120
             )
             if resp.status_code in (200, 201):
@@ -98,42 +163,113 @@ def deploy_connector(url: str, name: str, config: dict, retries: int = 3) -> Non
     raise RuntimeError(last_error)
 
 
-def verify_connector(url: str, name: str, timeout: int = 60) -> None:
-    """Poll connector status until task is RUNNING."""
-    print(f"Verifying connector: {name}")
+def verify_connectors(url: str, names: list, timeout: int = 60) -> None:
+    """Poll connector statuses until every named connector's task is RUNNING.
+
+    Uses GET /connectors?expand=status, which returns the status of every
+    connector in one request, so each poll costs one call however many
+    connectors are checked.
+    """
+    print(f"Verifying connectors: {', '.join(names)}")
+    pending = list(names)
+    start = time.time()
+    attempt = 0
+    while time.time() - start < timeout:
+        try:
+            resp = SESSION.get(f"{url}/connectors", params={"expand": "status"}, timeout=10)
+            if resp.status_code == 200:
+                statuses = resp.json()
+                for name in list(pending):
+                    status = statuses.get(name, {}).get("status", {})
+                    connector_state = status.get("connector", {}).get("state", "")
+                    tasks = status.get("tasks", [])
+                    if tasks and tasks[0].get("state") == "RUNNING":
+                        print(f"  Connector {name}: RUNNING")
+                        pending.remove(name)
+                    elif tasks and tasks[0].get("state") == "FAILED":
+                        trace = tasks[0].get("trace", "No trace available")
+                        print(f"  Connector {name} task FAILED: {trace}", file=sys.stderr)
+                        raise RuntimeError(f"Connector {name} task failed")
+                    else:
+                        task_state = tasks[0].get("state", "UNKNOWN") if tasks else "NO_TASKS"
+                        print(
+                            f"  Connector {name} state: {connector_state}, "
+                            f"Task state: {task_state}"
+                        )
+                if not pending:
+                    return
+        except requests.RequestException as e:
+            print(f"  Error checking status: {e}")
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+    raise TimeoutError(f"Connectors {', '.join(pending)} not RUNNING after {timeout}s")
+
+
+def poll_task_state(url: str, name: str, task_id: int = 0, timeout: int = 60) -> None:
+    """Poll a single task's status until it is RUNNING.
+
+    GET /connectors/{name}/tasks/{id}/status returns just that task's state,
+    which is all that changes when one task is restarted.
+    """
+    print(f"Verifying connector task: {name}/{task_id}")
     start = time.time()
+    attempt = 0
     while time.time() - start < timeout:
         try:
-            resp = requests.get(f"{url}/connectors/{name}/status", timeout=10)
+            resp = SESSION.get(f"{url}/connectors/{name}/tasks/{task_id}/status", timeout=10)
             if resp.status_code == 200:
                 status = resp.json()
-                connector_state = status.get("connector", {}).get("state", "")
-                tasks = status.get("tasks", [])
-                if tasks and tasks[0].get("state") == "RUNNING":
-                    print(f"  Connector {name}: RUNNING")
+                state = status.get("state", "UNKNOWN")
+                if state == "RUNNING":
+                    print(f"  Connector {name} task {task_id}: RUNNING")
                     return
-                elif tasks and tasks[0].get("state") == "FAILED":
-                    trace = tasks[0].get("trace", "No trace available")
+                if state == "FAILED":
+                    trace = status.get("trace", "No trace available")
                     print(f"  Connector {name} task FAILED: {trace}", file=sys.stderr)
                     raise RuntimeError(f"Connector {name} task failed")
-                else:
-                    task_state = tasks[0].get("state", "UNKNOWN") if tasks else "NO_TASKS"
-                    print(f"  Connector state: {connector_state}, Task state: {task_state}")
+                print(f"  Task state: {state}")
         except requests.RequestException as e:
             print(f"  Error checking status: {e}")
-        time.sleep(5)
-    raise TimeoutError(f"Connector {name} not RUNNING after {timeout}s")
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+    raise TimeoutError(f"Connector {name} task {task_id} not RUNNING after {timeout}s")
 
 
-def build_source_config(master_uri: str, master_password: str) -> dict:
-    """Build Neo4j CDC source connector configuration."""
+def wait_for_task_restart(url: str, name: str, task_id: int = 0, settle: int = 3) -> None:
+    """Wait until a restarted task has left the RUNNING state.
+
+    Task status is read back asynchronously from the connect-status topic,
+    so right after a restart request it can still show the old task as
+    RUNNING. Waits for a non-RUNNING state (UNASSIGNED, RESTARTING, ...) so
+    that the next RUNNING seen belongs to the new task. If the transition
+    happens between polls and is missed, gives up after settle seconds, so
+    a missed transition costs at most settle seconds (3 by default) before
+    poll_task_state waits for RUNNING.
+    """
+    start = time.time()
+    attempt = 0
+    while time.time() - start < settle:
+        try:
+            resp = SESSION.get(f"{url}/connectors/{name}/tasks/{task_id}/status", timeout=10)
+            if resp.status_code == 200:
+                state = resp.json().get("state", "UNKNOWN")
+                if state != "RUNNING":
+                    print(f"  Task {name}/{task_id} restarting (state: {state})")
+                    return
+        except requests.RequestException as e:
+            print(f"  Error checking status: {e}")
+        time.sleep(backoff_delay(attempt, cap=1.0))
+        attempt += 1
+    print(f"  No restart transition seen for {name}/{task_id} after {settle}s, continuing")
+
+
+def neo4j_connection_config(uri: str, password: str) -> dict:
+    """Build the Neo4j connection settings shared by the source and sink connectors."""
     return {
-        "connector.class": "org.neo4j.connectors.kafka.source.Neo4jConnector",
-        "tasks.max": "1",
-        "neo4j.uri": master_uri,
+        "neo4j.uri": uri,
         "neo4j.authentication.type": "BASIC",
         "neo4j.authentication.basic.username": "neo4j",
-        "neo4j.authentication.basic.password": master_password,
+        "neo4j.authentication.basic.password": password,
         # Neo4j driver connection settings for reliability
         "neo4j.connection-timeout": "30s",
         "neo4j.max-retry-time": "30s",
@@ -141,6 +277,24 @@ def build_source_config(master_uri: str, master_password: str) -> dict:
         "neo4j.pool.connection-acquisition-timeout": "60s",
         "neo4j.pool.max-connection-lifetime": "30m",
         "neo4j.pool.idle-time-before-connection-test": "1m",
+    }
+
+
+# Both connectors exchange schema-enabled JSON keys and values
+JSON_CONVERTER_CONFIG = {
+    "key.converter": "org.apache.kafka.connect.json.JsonConverter",
+    "value.converter": "org.apache.kafka.connect.json.JsonConverter",
+    "key.converter.schemas.enable": "true",
+    "value.converter.schemas.enable": "true",
+}
+
+
+def build_source_config(master_uri: str, master_password: str) -> dict:
+    """Build Neo4j CDC source connector configuration."""
+    return {
+        "connector.class": "org.neo4j.connectors.kafka.source.Neo4jConnector",
+        "tasks.max": "1",
+        **neo4j_connection_config(master_uri, master_password),
         # CDC source settings
         "neo4j.source-strategy": "CDC",
         "neo4j.start-from": "EARLIEST",
@@ -149,10 +303,7 @@ def build_source_config(master_uri: str, master_password: str) -> dict:
         # Single partition ensures strict ordering: nodes arrive before relationships
         "topic.creation.default.partitions": 1,
         "topic.creation.default.replication.factor": 1,
-        "key.converter": "org.apache.kafka.connect.json.JsonConverter",
-        "value.converter": "org.apache.kafka.connect.json.JsonConverter",
-        "key.converter.schemas.enable": "true",
-        "value.converter.schemas.enable": "true",
+        **JSON_CONVERTER_CONFIG,
         "errors.tolerance": "none",
         "errors.log.enable": "true",
         "errors.log.include.messages": "true",
@@ -165,17 +316,7 @@ def build_sink_config(subscriber_uri: str, subscriber_password: str) -> dict:
         "connector.class": "org.neo4j.connectors.kafka.sink.Neo4jConnector",
         "tasks.max": "1",
         "topics": "cdc-all",
-        "neo4j.uri": subscriber_uri,
-        "neo4j.authentication.type": "BASIC",
-        "neo4j.authentication.basic.username": "neo4j",
-        "neo4j.authentication.basic.password": subscriber_password,
-        # Neo4j driver connection settings for reliability
-        "neo4j.connection-timeout": "30s",
-        "neo4j.max-retry-time": "30s",
-        "neo4j.pool.max-connection-pool-size": "10",
-        "neo4j.pool.connection-acquisition-timeout": "60s",
-        "neo4j.pool.max-connection-lifetime": "30m",
-        "neo4j.pool.idle-time-before-connection-test": "1m",
+        **neo4j_connection_config(subscriber_uri, subscriber_password),
         # CDC sink settings
         "neo4j.cdc.source-id.topics": "cdc-all",
         "neo4j.cdc.source-id.label-name": "SourceEvent",
@@ -187,10 +328,7 @@ def build_sink_config(subscriber_uri: str, subscriber_password: str) -> dict:
         "neo4j.retry-max-attempts": "10",
         # Reduce consumer poll latency
         "consumer.override.fetch.max.wait.ms": "100",
-        "key.converter": "org.apache.kafka.connect.json.JsonConverter",
-        "value.converter": "org.apache.kafka.connect.json.JsonConverter",
-        "key.converter.schemas.enable": "true",
-        "value.converter.schemas.enable": "true",
+        **JSON_CONVERTER_CONFIG,
         # Fail visibly so we see what's broken
         "errors.tolerance": "none",
         "errors.retry.timeout": "120000",
@@ -226,7 +364,10 @@ def main() -> int:
         missing.append("SUBSCRIBER_NEO4J_PASSWORD")
 
     if missing:
-        print(f"Error: Missing required environment variables: {', '.join(missing)}", file=sys.stderr)
+        print(
+            f"Error: Missing required environment variables: {', '.join(missing)}",
+            file=sys.stderr,
+        )
         return 1
 
     try:
@@ -237,26 +378,37 @@ def main() -> int:
         source_config = build_source_config(master_uri, master_password)
         sink_config = build_sink_config(subscriber_uri, subscriber_password)
 
-        # Deploy connectors (PUT is idempotent)
-        deploy_connector(connect_url, "neo4j-master-publisher", source_config)
-        deploy_connector(connect_url, "neo4j-subscriber-consumer", sink_config)
+        # Deploy connectors concurrently (PUT is idempotent); each can take
+        # 60-90s on an Event Hubs cold start
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            deploys = [
+                executor.submit(
+                    deploy_connector, connect_url, "neo4j-master-publisher", source_config
+                ),
+                executor.submit(
+                    deploy_connector, connect_url, "neo4j-subscriber-consumer", sink_config
+                ),
+            ]
+            for deploy in deploys:
+                deploy.result()
 
         # Verify connectors are running
-        verify_connector(connect_url, "neo4j-master-publisher")
-        verify_connector(connect_url, "neo4j-subscriber-consumer")
+        verify_connectors(connect_url, ["neo4j-master-publisher", "neo4j-subscriber-consumer"])
 
         # Work around Event Hubs metadata timeout on fresh deploy:
         # The source task often stalls on its first CDC poll due to slow
         # topic metadata response. Restarting clears this stall.
         print("Restarting source task to clear Event Hubs metadata stall...")
-        resp = requests.post(
+        resp = SESSION.post(
             f"{connect_url}/connectors/neo4j-master-publisher/tasks/0/restart",
             timeout=10
         )
         if resp.status_code not in (200, 202, 204):
-            print(f"  Warning: restart returned {resp.status_code}", file=sys.stderr)
-        # Poll until task is RUNNING again (no blind sleep)
-        verify_connector(connect_url, "neo4j-master-publisher")
+            print(f"  Warning: restart returned {resp.status_code}: {resp.text}", file=sys.stderr)
+        # Status is read back asynchronously, so first wait for the old task
+        # to leave RUNNING, then poll until the new one is RUNNING
+        wait_for_task_restart(connect_url, "neo4j-master-publisher")
+        poll_task_state(connect_url, "neo4j-master-publisher")
 
         print("\nAll connectors deployed and running successfully!")
         return 0
@@ -267,6 +419,8 @@ def main() -> int:
     except Exception as e:
         print(f"\nUnexpected error: {e}", file=sys.stderr)
         return 1
+    finally:
+        SESSION.close()
 
 
 if __name__ == "__main__":